@@ -0,0 +1,224 @@
+# benchmarks/run.py ⏱️
+# Timings for the enforcement hot paths, written to JSON for run-to-run comparison.
+#
+#   python3 benchmarks/run.py                  # full run -> benchmarks/results/<stamp>.json
+#   python3 benchmarks/run.py --quick          # skip the 1M-line hosts file
+#   python3 benchmarks/run.py --compare OLD.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import datetime
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import hosts_control
+import usage_store
+import snapshot_store
+from hostlists import render_blacklist
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def measure(fn, repeat=5, number=1):
+    """Best/median/mean seconds per call over `repeat` rounds of `number` calls."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        "best": min(rounds),
+        "median": statistics.median(rounds),
+        "mean": statistics.fmean(rounds),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def full_schedule():
+    return {f"{day},{hour}": (day_idx + hour) % 3
+            for day_idx, day in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
+            for hour in range(24)}
+
+
+class Sandbox:
+    """Points hosts_control and the usage/snapshot stores at a temp dir for the duration of a run."""
+
+    NAMES = ("HOSTS_FILE", "CLEAN_FILE", "BLOCKED_FILE", "WHITELIST_FILE", "SETTINGS_FILE")
+
+    def __enter__(self):
+        self.dir = tempfile.mkdtemp(prefix="focus-bench-")
+        self.saved = {name: getattr(hosts_control, name) for name in self.NAMES}
+        self.saved_db = usage_store.USAGE_DB
+        self.saved_store = snapshot_store.STORE_DIR
+
+        hosts_control.HOSTS_FILE = os.path.join(self.dir, "etc-hosts")
+        hosts_control.CLEAN_FILE = os.path.join(self.dir, "hosts.clean")
+        hosts_control.BLOCKED_FILE = os.path.join(self.dir, "hosts.blocked")
+        hosts_control.WHITELIST_FILE = os.path.join(self.dir, "hosts.whitelist")
+        hosts_control.SETTINGS_FILE = os.path.join(self.dir, "settings.json")
+        usage_store.USAGE_DB = os.path.join(self.dir, "usage.db")
+        snapshot_store.STORE_DIR = os.path.join(self.dir, "store")
+
+        shutil.copy(os.path.join(ROOT, "hosts", "hosts.clean"), hosts_control.CLEAN_FILE)
+        shutil.copy(os.path.join(ROOT, "hosts", "hosts.whitelist"), hosts_control.WHITELIST_FILE)
+        shutil.copy(hosts_control.CLEAN_FILE, hosts_control.HOSTS_FILE)
+        hosts_control.save_settings({
+            "mode": "blacklist",
+            "schedule_enabled": True,
+            "schedule_data": {"blacklist": full_schedule(), "whitelist": full_schedule()},
+        })
+        return self
+
+    def write_hosts(self, lines):
+        domains = [f"site{i}.example.com" for i in range(lines // 2)]
+        with open(hosts_control.BLOCKED_FILE, "w") as f:
+            f.write(render_blacklist(domains))
+        return hosts_control.BLOCKED_FILE
+
+    def __exit__(self, *exc):
+        for name, value in self.saved.items():
+            setattr(hosts_control, name, value)
+        usage_store.USAGE_DB = self.saved_db
+        snapshot_store.STORE_DIR = self.saved_store
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def bench_hashing(sandbox, sizes):
+    results = {}
+    for lines in sizes:
+        path = sandbox.write_hosts(lines)
+        label = f"sha256sum_{lines // 1000}k" if lines < 1_000_000 else f"sha256sum_{lines // 1_000_000}m"
+        results[label] = measure(lambda: hosts_control.sha256sum(path), repeat=5)
+        results[label]["bytes"] = os.path.getsize(path)
+    return results
+
+
+def bench_schedule(sandbox):
+    return {"get_current_schedule_state": measure(hosts_control.get_current_schedule_state,
+                                                  repeat=5, number=200)}
+
+
+def bench_settings(sandbox):
+    data = hosts_control.load_settings()
+    return {
+        "settings_load": measure(hosts_control.load_settings, repeat=5, number=200),
+        "settings_save": measure(lambda: hosts_control.save_settings(data), repeat=5, number=20),
+    }
+
+
+def bench_hosts_apply(sandbox):
+    sandbox.write_hosts(1000)
+    results = {
+        "block": measure(lambda: hosts_control.block(interactive=False), repeat=5, number=5),
+        "unblock": measure(lambda: hosts_control.unblock(interactive=False), repeat=5, number=5),
+        "is_blocked": measure(hosts_control.is_blocked, repeat=5, number=100),
+    }
+    usage_store._shutdown()
+    return results
+
+
+def bench_analytics(sandbox, profiles=36):
+    try:
+        from schedule_analytics import analyze
+    except ImportError as e:
+        return {"schedule_analytics": {"skipped": f"NumPy unavailable: {e}"}}
+
+    schedules = {f"profile{i}": full_schedule() for i in range(profiles)}
+    modes = {name: ("blacklist", "whitelist")[i % 2] for i, name in enumerate(schedules)}
+    return {f"schedule_analytics_{profiles}": measure(
+        lambda: analyze(schedules, modes, active="profile0"), repeat=5, number=5)}
+
+
+def bench_grid(sandbox):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from schedule_widget import ScheduleGridWidget
+    except ImportError as e:
+        return {"schedule_grid": {"skipped": f"PyQt5 unavailable: {e}"}}
+
+    app = QApplication.instance() or QApplication([])
+    schedule = full_schedule()
+
+    def open_grid():
+        grid = ScheduleGridWidget(mode="blacklist")
+        grid.set_schedule(schedule)
+        grid.deleteLater()
+
+    grid = ScheduleGridWidget(mode="blacklist")
+    grid.set_schedule(schedule)
+    grid.show()
+    app.processEvents()
+    results = {
+        "grid_open": measure(open_grid, repeat=5, number=3),
+        "grid_repaint": measure(grid.grab, repeat=5, number=5),
+    }
+    grid.close()
+    app.processEvents()
+    return results
+
+
+def compare(current, previous):
+    lines = []
+    for name, new in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if "median" not in new or not old or "median" not in old:
+            continue
+        change = (new["median"] - old["median"]) / old["median"] * 100
+        lines.append(f"{name:32s} {old['median'] * 1e3:10.3f} ms -> {new['median'] * 1e3:10.3f} ms  {change:+7.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Focus Blocker benchmarks")
+    parser.add_argument("--quick", action="store_true", help="skip the 1M-line hosts file")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<stamp>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="previous results to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [1_000, 100_000] if args.quick else [1_000, 100_000, 1_000_000]
+    results = {}
+    with Sandbox() as sandbox:
+        for bench in (lambda: bench_hashing(sandbox, sizes), lambda: bench_schedule(sandbox),
+                      lambda: bench_settings(sandbox), lambda: bench_hosts_apply(sandbox),
+                      lambda: bench_analytics(sandbox), lambda: bench_grid(sandbox)):
+            results.update(bench())
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, stats in results.items():
+        if "median" in stats:
+            print(f"{name:32s} {stats['median'] * 1e3:10.3f} ms")
+        else:
+            print(f"{name:32s} {stats.get('skipped', '')}")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            print("\n" + compare(report, json.load(f)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+# cli.py 🖥️
+# Scriptable, Qt-free bulk edits for site lists, schedules and profiles.
+# Every invocation is one transaction: validate everything, write each file
+# once (atomically), re-apply blocking once, and print a JSON result.
+
+import os
+import sys
+import json
+import argparse
+import time
+import hosts_control
+from resolver_cache import post_apply
+from snapshot_store import SnapshotStore
+from usage_store import record_event, EVENT_BLOCK, EVENT_UNBLOCK
+from hostlists import iter_names, normalize_all, parse_list, render_list
+from schedule_spec import parse_range, grid_to_slots, slots_to_grid
+
+LISTS = ("blacklist", "whitelist")
+PROFILE_KEYS = {"mode", "schedule_enabled", "schedule", "blacklist", "whitelist"}
+
+
+class CliError(Exception):
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+
+def list_path(name):
+    return hosts_control.BLOCKED_FILE if name == "blacklist" else hosts_control.WHITELIST_FILE
+
+
+class Transaction:
+    """Collects settings and list edits, then writes each touched file once."""
+
+    def __init__(self):
+        self.settings = hosts_control.load_settings()
+        self.settings_changed = False
+        self._lists = {}
+
+    def domains(self, name):
+        if name not in self._lists:
+            try:
+                with open(list_path(name), "r") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = ""
+            self._lists[name] = [parse_list(name, text), text]
+        return self._lists[name][0]
+
+    def set_domains(self, name, domains):
+        self.domains(name)
+        self._lists[name][0] = domains
+
+    def update_settings(self, **values):
+        self.settings.update(values)
+        self.settings_changed = True
+
+    def commit(self, apply=True):
+        # Must be sampled before the block file changes underneath /etc/hosts
+        was_blocked = apply and hosts_control.is_blocked()
+
+        contents = {}
+        for name, (domains, text) in self._lists.items():
+            rendered = render_list(name, domains, text)
+            if rendered != text:
+                contents[list_path(name)] = rendered
+        if self.settings_changed:
+            contents[hosts_control.SETTINGS_FILE] = json.dumps(self.settings, indent=4)
+
+        if contents:
+            hosts_control.write_files_atomic(contents)
+
+        # One re-apply, and only if the active block file no longer matches /etc/hosts
+        result = {"changed_files": sorted(contents), "reapplied": False}
+        if contents and was_blocked and not hosts_control.is_blocked():
+            started = time.monotonic()
+            result["reapplied"] = hosts_control.block(interactive=os.geteuid() != 0, prompt=False)
+            if not result["reapplied"]:
+                raise CliError("files were written but re-applying /etc/hosts failed "
+                               "(run as root or install the sudoers rule)", **result)
+            result["enforcement"] = post_apply(hosts_control.HOSTS_FILE, started=started)
+        return result
+
+
+def read_names(args):
+    """Names from the command line, --file, or stdin when neither is given."""
+    if args.names:
+        return list(iter_names(args.names))
+    if args.file and args.file != "-":
+        with open(args.file, "r") as f:
+            return list(iter_names(f))
+    return list(iter_names(sys.stdin))
+
+
+def validated(names, skip_invalid):
+    domains, invalid = normalize_all(names)
+    if invalid and not skip_invalid:
+        raise CliError(f"{len(invalid)} invalid domain(s); nothing was written", invalid=invalid)
+    return domains, invalid
+
+
+def cmd_domains(args):
+    tx = Transaction()
+    current = tx.domains(args.list)
+
+    if args.action == "list":
+        return {"list": args.list, "domains": current, "total": len(current)}
+
+    domains, invalid = validated(read_names(args), args.skip_invalid)
+    result = {"list": args.list, "invalid": invalid}
+
+    if args.action == "add":
+        known = set(current)
+        new = [d for d in domains if d not in known]
+        tx.set_domains(args.list, current + new)
+        result["added"] = len(new)
+    elif args.action == "remove":
+        drop = set(domains)
+        kept = [d for d in current if d not in drop]
+        tx.set_domains(args.list, kept)
+        result["removed"] = len(current) - len(kept)
+    else:  # import replaces the whole list
+        tx.set_domains(args.list, domains)
+        result["imported"] = len(domains)
+
+    result["total"] = len(tx.domains(args.list))
+    result.update(tx.commit(apply=not args.no_apply))
+    return result
+
+
+def _schedule_grid(specs, existing=None):
+    slots = grid_to_slots(existing or {})
+    for spec in specs:
+        slots |= parse_range(spec)
+    return slots_to_grid(slots), len(slots) / 2
+
+
+def _range_specs(value, where):
+    """A profile's schedule entry: one range string or a list of them."""
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(spec, str) for spec in value):
+        raise CliError(f"{where} must be a range string or a list of range strings")
+    return value
+
+
+def _load_profile(path):
+    try:
+        if path == "-":
+            profile = json.load(sys.stdin)
+        else:
+            with open(path, "r") as f:
+                profile = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CliError(f"cannot read profile: {e}")
+    if not isinstance(profile, dict):
+        raise CliError("profile must be a JSON object")
+    return profile
+
+
+def cmd_schedule_stats(args):
+    try:
+        from schedule_analytics import analyze
+    except ImportError as e:
+        raise CliError(f"schedule stats needs NumPy: {e}")
+
+    settings = hosts_control.load_settings()
+    schedule_data = settings.get("schedule_data", {})
+    schedules, modes = {}, {}
+    for mode in hosts_control.MODES:
+        schedules[mode] = schedule_data.get(mode, {})
+        modes[mode] = mode
+
+    for path in args.profile or []:
+        profile = _load_profile(path)
+        schedule = profile.get("schedule", {})
+        if not isinstance(schedule, dict):
+            raise CliError(f"{path}: schedule must map a mode to a list of ranges")
+        for mode, specs in schedule.items():
+            if mode not in hosts_control.MODES:
+                raise CliError(f"{path}: unknown schedule mode {mode!r}")
+            specs = _range_specs(specs, f"{path}: {mode} schedule")
+            try:
+                schedules[f"{path}:{mode}"], _ = _schedule_grid(specs)
+            except ValueError as e:
+                raise CliError(f"{path}: {e}")
+            modes[f"{path}:{mode}"] = mode
+
+    active = settings.get("mode", "blacklist")
+    started = time.perf_counter()
+    result = analyze(schedules, modes, active=active, transitions=args.transitions)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    result["active"] = active
+    result["schedule_enabled"] = settings.get("schedule_enabled", False)
+    return result
+
+
+def cmd_schedule(args):
+    if args.action == "stats":
+        return cmd_schedule_stats(args)
+
+    tx = Transaction()
+    mode = args.mode or tx.settings.get("mode", "blacklist")
+    schedule_data = dict(tx.settings.get("schedule_data", {}))
+
+    try:
+        if args.action == "clear":
+            grid, hours = _schedule_grid([])
+        else:
+            existing = schedule_data.get(mode) if args.merge else None
+            grid, hours = _schedule_grid(args.specs, existing)
+    except ValueError as e:
+        raise CliError(str(e))
+
+    schedule_data[mode] = grid
+    values = {"schedule_data": schedule_data}
+    if args.enable is not None:
+        values["schedule_enabled"] = args.enable
+    tx.update_settings(**values)
+
+    result = {"mode": mode, "hours_per_week": hours,
+              "schedule_enabled": tx.settings.get("schedule_enabled", False)}
+    result.update(tx.commit(apply=not args.no_apply))
+    return result
+
+
+def cmd_profile(args):
+    profile = _load_profile(args.path)
+    unknown = set(profile) - PROFILE_KEYS
+    if unknown:
+        raise CliError(f"unknown profile keys: {', '.join(sorted(unknown))}")
+
+    tx = Transaction()
+    settings = {}
+    result = {"profile": args.path}
+
+    if "mode" in profile:
+        if profile["mode"] not in hosts_control.MODES:
+            raise CliError(f"mode must be one of: {', '.join(hosts_control.MODES)}")
+        settings["mode"] = profile["mode"]
+    if "schedule_enabled" in profile:
+        if not isinstance(profile["schedule_enabled"], bool):
+            raise CliError("schedule_enabled must be true or false")
+        settings["schedule_enabled"] = profile["schedule_enabled"]
+    if "schedule" in profile:
+        if not isinstance(profile["schedule"], dict):
+            raise CliError("schedule must map a mode to a list of ranges")
+        schedule_data = dict(tx.settings.get("schedule_data", {}))
+        for mode, specs in profile["schedule"].items():
+            if mode not in hosts_control.MODES:
+                raise CliError(f"unknown schedule mode {mode!r}")
+            specs = _range_specs(specs, f"{mode} schedule")
+            try:
+                schedule_data[mode], _ = _schedule_grid(specs)
+            except ValueError as e:
+                raise CliError(f"{mode} schedule: {e}")
+        settings["schedule_data"] = schedule_data
+
+    # Validate every list before touching anything
+    for name in LISTS:
+        if name in profile:
+            if not isinstance(profile[name], list):
+                raise CliError(f"{name} must be a list of domains")
+            bad = [entry for entry in profile[name] if not isinstance(entry, str)]
+            if bad:
+                raise CliError(f"{name} entries must be strings", invalid=bad)
+            domains, _ = validated(profile[name], skip_invalid=False)
+            tx.set_domains(name, domains)
+            result[name] = len(domains)
+
+    if settings:
+        tx.update_settings(**settings)
+    result.update(tx.commit(apply=not args.no_apply))
+    return result
+
+
+def cmd_history(args):
+    store = SnapshotStore()
+    entries = [
+        {
+            "hash": entry["hash"],
+            "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["ts"])),
+            "kind": entry["kind"],
+            "label": entry["label"],
+        }
+        for entry in store.history(args.limit)
+    ]
+    return {"refs": store.index["refs"], "history": entries}
+
+
+def cmd_rollback(args):
+    store = SnapshotStore()
+    try:
+        digest = store.resolve(args.ref)
+    except KeyError as e:
+        raise CliError(str(e.args[0]))
+
+    if args.dry_run:
+        return {"hash": digest, "restored": False, "dry_run": True}
+    if not hosts_control.restore_snapshot(digest, interactive=os.geteuid() != 0, store=store, prompt=False):
+        raise CliError(f"failed to restore snapshot {digest[:12]} "
+                       "(run as root or install the sudoers rule)")
+    # A rollback moves between blocked and clean like block()/unblock() do
+    blocked = hosts_control.is_blocked()
+    if blocked:
+        record_event(EVENT_BLOCK, hosts_control.get_current_mode())
+    else:
+        record_event(EVENT_UNBLOCK)
+    return {"hash": digest, "restored": True, "blocked": blocked}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Focus Blocker bulk configuration (JSON output)")
+    parser.add_argument("--no-apply", action="store_true",
+                        help="write files but do not re-apply /etc/hosts")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    domains = commands.add_parser("domains", help="edit the blacklist/whitelist sites")
+    domain_actions = domains.add_subparsers(dest="action", required=True)
+    list_option = argparse.ArgumentParser(add_help=False)
+    list_option.add_argument("--list", choices=LISTS, default="blacklist")
+    names_input = argparse.ArgumentParser(add_help=False)
+    names_input.add_argument("names", nargs="*", help="domains (default: read --file or stdin)")
+    names_input.add_argument("--file", help="read names from a file ('-' for stdin)")
+    names_input.add_argument("--skip-invalid", action="store_true",
+                             help="drop invalid names instead of aborting")
+    domain_actions.add_parser("add", parents=[list_option, names_input], help="add sites")
+    domain_actions.add_parser("remove", parents=[list_option, names_input], help="remove sites")
+    domain_actions.add_parser("import", parents=[list_option, names_input],
+                              help="replace the whole list")
+    domain_actions.add_parser("list", parents=[list_option], help="print the list")
+    domains.set_defaults(func=cmd_domains)
+
+    schedule = commands.add_parser("schedule", help="set or analyze the weekly schedule")
+    schedule_actions = schedule.add_subparsers(dest="action", required=True)
+    schedule_edit = argparse.ArgumentParser(add_help=False)
+    schedule_edit.add_argument("--mode", choices=hosts_control.MODES,
+                               help="schedule to edit (default: current mode)")
+    schedule_edit.add_argument("--enable", dest="enable", action="store_true", default=None)
+    schedule_edit.add_argument("--disable", dest="enable", action="store_false")
+    schedule_set = schedule_actions.add_parser("set", parents=[schedule_edit],
+                                               help="replace (or --merge into) a schedule")
+    schedule_set.add_argument("specs", nargs="+", metavar="RANGE",
+                              help="e.g. 'Mon-Fri 09:00-17:00' or 'Sat,Sun 10:00-12:00,14:00-16:30'")
+    schedule_set.add_argument("--merge", action="store_true", help="add to the existing schedule")
+    schedule_actions.add_parser("clear", parents=[schedule_edit], help="empty a schedule")
+    schedule_stats = schedule_actions.add_parser("stats", help="coverage, overlaps and transitions")
+    schedule_stats.add_argument("--profile", action="append", metavar="JSON",
+                                help="also analyze this profile's schedules (repeatable)")
+    schedule_stats.add_argument("--transitions", type=int, default=5,
+                                help="number of upcoming transitions to list")
+    schedule.set_defaults(func=cmd_schedule)
+
+    profile = commands.add_parser("profile", help="apply a JSON profile in one step")
+    profile.add_argument("action", choices=["apply"])
+    profile.add_argument("path", help="profile JSON file ('-' for stdin)")
+    profile.set_defaults(func=cmd_profile)
+
+    history = commands.add_parser("history", help="list stored /etc/hosts snapshots")
+    history.add_argument("--limit", type=int, default=20, help="newest entries to show (0 = all)")
+    history.set_defaults(func=cmd_history, action="list")
+
+    rollback = commands.add_parser("rollback", help="restore /etc/hosts from a snapshot")
+    rollback.add_argument("ref", help="snapshot hash (or unique prefix) or ref name, e.g. last_clean")
+    rollback.add_argument("--dry-run", action="store_true", help="resolve the snapshot only")
+    rollback.set_defaults(func=cmd_rollback, action="restore")
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        result = args.func(args)
+        output, code = dict(ok=True, command=f"{args.command} {args.action}", **result), 0
+    except CliError as e:
+        output, code = dict(ok=False, error=str(e), **e.details), 1
+    except (OSError, ValueError) as e:
+        # ValueError covers UnicodeDecodeError from non-UTF-8 input files
+        output, code = {"ok": False, "error": str(e)}, 1
+
+    json.dump(output, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
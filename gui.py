@@ -13,6 +13,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtCore import QTimer, Qt
 from schedule_widget import ScheduleGridWidget
+from usage_store import UsageStore
 
 APP_DIR = "/home/atli/Desktop/Block_python"
 CLEAN_FILE = f"{APP_DIR}/hosts/hosts.clean"
@@ -26,7 +27,7 @@ class MainWindow(QWidget):
         print("🧠 GUI Initialized")
 
         self.setWindowTitle("Focus Blocker Settings")
-        self.setFixedSize(600, 400)
+        self.setFixedSize(600, 480)
         self.load_settings()
 
         main_layout = QVBoxLayout()
@@ -67,6 +68,14 @@ class MainWindow(QWidget):
         schedule_group.setLayout(schedule_layout)
         main_layout.addWidget(schedule_group)
 
+        usage_group = QGroupBox("This Week")
+        usage_layout = QVBoxLayout()
+        self.usage_label = QLabel()
+        usage_layout.addWidget(self.usage_label)
+        usage_group.setLayout(usage_layout)
+        main_layout.addWidget(usage_group)
+        self.update_usage_summary()
+
         self.change_password_button = QPushButton("Change Password")
         self.change_password_button.clicked.connect(self.change_password)
         main_layout.addWidget(self.change_password_button)
@@ -100,6 +109,24 @@ class MainWindow(QWidget):
             print(f"[ERROR] Failed to save settings: {e}")
             QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
 
+    def update_usage_summary(self):
+        try:
+            store = UsageStore()
+            try:
+                summary = store.summary(days=7)
+            finally:
+                store.close()
+        except Exception as e:
+            print(f"[ERROR] Failed to load usage history: {e}")
+            self.usage_label.setText("Usage history unavailable.")
+            return
+
+        self.usage_label.setText(
+            f"Blocked: {summary['blocked_hours']:.1f} h   •   "
+            f"Unblock attempts: {summary['unblock_attempts']}   •   "
+            f"Schedule overrides: {summary['overrides']}"
+        )
+
     def update_mode_button(self):
         next_mode = "Whitelist" if self.mode == "blacklist" else "Blacklist"
         self.mode_button.setText(f"Switch to {next_mode} Mode")
@@ -125,7 +152,7 @@ class MainWindow(QWidget):
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Detailed Schedule")
-        dialog.setFixedSize(850, 430)
+        dialog.setFixedSize(850, 470)
 
         layout = QVBoxLayout(dialog)
 
@@ -134,6 +161,44 @@ class MainWindow(QWidget):
         grid.set_schedule(schedule)
         layout.addWidget(grid)
 
+        # 🧠 Analytics row: weekly coverage + overlap heatmap with the other mode
+        other_mode = "whitelist" if self.mode == "blacklist" else "blacklist"
+        analytics_layout = QHBoxLayout()
+        overlap_checkbox = QCheckBox(f"Show overlap with {other_mode} schedule")
+        analytics_label = QLabel()
+        analytics_layout.addWidget(overlap_checkbox)
+        analytics_layout.addStretch()
+        analytics_layout.addWidget(analytics_label)
+        layout.addLayout(analytics_layout)
+
+        try:
+            import schedule_analytics
+        except ImportError as e:
+            print(f"[DEBUG] ⚠️ Schedule analytics unavailable: {e}")
+            schedule_analytics = None
+            overlap_checkbox.setEnabled(False)
+            analytics_label.setText("Install NumPy for schedule analytics.")
+
+        def refresh_analytics():
+            if schedule_analytics is None:
+                return
+            states = schedule_analytics.grid_states(
+                [grid.get_schedule(), self.schedule_data.get(other_mode, {})]
+            )
+            masks = schedule_analytics.minute_masks(states)
+            blocking = schedule_analytics.blocking_masks(masks, [self.mode, other_mode])
+            blocked_hours = schedule_analytics.coverage_hours(blocking)[0]
+            overlap = schedule_analytics.overlap_hours(masks)[0, 1]
+            analytics_label.setText(f"Blocks {blocked_hours:.1f} h/week • {overlap:.1f} h overlap")
+            # Shade only the minutes painted in both schedules
+            grid.set_heatmap(
+                schedule_analytics.hourly_heatmap(masks[0] & masks[1]) if overlap_checkbox.isChecked() else None
+            )
+
+        overlap_checkbox.toggled.connect(refresh_analytics)
+        grid.schedule_changed.connect(refresh_analytics)
+        refresh_analytics()
+
         # 🧠 Legend row
         legend_layout = QHBoxLayout()
 
@@ -186,11 +251,13 @@ class MainWindow(QWidget):
             updated_schedule = grid.get_schedule()
             self.schedule_data[self.mode] = updated_schedule
             self.save_settings()
+            refresh_analytics()
             print("[DEBUG] ✅ Schedule saved")
             QMessageBox.information(self, "Saved", "Schedule updated successfully.")
 
         def on_clear():
             grid.clear_all()
+            refresh_analytics()
             print("[DEBUG] 🧼 Schedule grid cleared")
 
         save_button.clicked.connect(on_save)
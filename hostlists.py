@@ -0,0 +1,126 @@
+# hostlists.py 📋
+# Parse, normalize and render the blacklist/whitelist hosts files
+
+import re
+import ipaddress
+
+BLACKLIST_HEADER = "# Generated by Focus Blocker"
+WHITELIST_MARKER = "# Add exceptions below"
+SINK_ADDRESS = "127.0.0.1"
+SINK_ADDRESSES = (SINK_ADDRESS, "0.0.0.0")
+
+_LABEL = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+
+
+def normalize_domain(raw):
+    """Lowercases, strips scheme/path/port/www. and IDNA-encodes a name.
+
+    Raises ValueError for anything that is not a valid hostname.
+    """
+    name = raw.strip().lower()
+    if "://" in name:
+        name = name.split("://", 1)[1]
+    name = name.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    if name.startswith("www."):
+        name = name[4:]
+    try:
+        name = name.encode("idna").decode("ascii")
+    except UnicodeError:
+        raise ValueError(f"invalid domain: {raw.strip()!r}")
+    if not name or len(name) > 253 or not all(_LABEL.match(label) for label in name.split(".")):
+        raise ValueError(f"invalid domain: {raw.strip()!r}")
+    return name
+
+
+def _is_address(token):
+    try:
+        ipaddress.ip_address(token)
+        return True
+    except ValueError:
+        return False
+
+
+def iter_names(lines):
+    """Yields raw names from plain lists or hosts-format lines, skipping comments."""
+    for line in lines:
+        tokens = line.split("#", 1)[0].split()
+        if len(tokens) > 1 and _is_address(tokens[0]):
+            tokens = tokens[1:]
+        yield from tokens
+
+
+def sink_entries(lines):
+    """Yields (name, address) for every non-localhost name pointed at a sink address."""
+    for line in lines:
+        tokens = line.split("#", 1)[0].split()
+        if len(tokens) < 2 or tokens[0] not in SINK_ADDRESSES:
+            continue
+        for name in tokens[1:]:
+            if name != "localhost" and not name.endswith(".localhost"):
+                yield name.lower(), tokens[0]
+
+
+def is_rendered(text):
+    """True if hosts text is one of our lists or otherwise sinks real names."""
+    lines = text.splitlines()
+    if text.startswith(BLACKLIST_HEADER) or WHITELIST_MARKER in lines:
+        return True
+    return next(sink_entries(lines), None) is not None
+
+
+def normalize_all(names):
+    """Returns (domains, invalid): deduped normalized names in first-seen order."""
+    seen = {}
+    invalid = []
+    for raw in names:
+        try:
+            seen.setdefault(normalize_domain(raw), None)
+        except ValueError:
+            invalid.append(raw)
+    return list(seen), invalid
+
+
+def parse_blacklist(text):
+    domains, _ = normalize_all(iter_names(text.splitlines()))
+    return domains
+
+
+def render_blacklist(domains):
+    lines = [BLACKLIST_HEADER]
+    for domain in domains:
+        lines.append(f"{SINK_ADDRESS} {domain}")
+        lines.append(f"{SINK_ADDRESS} www.{domain}")
+    return "\n".join(lines) + "\n"
+
+
+def _split_whitelist(text):
+    lines = text.splitlines()
+    if WHITELIST_MARKER in lines:
+        idx = lines.index(WHITELIST_MARKER)
+        return lines[:idx], lines[idx + 1:]
+    return lines, []
+
+
+def parse_whitelist(text):
+    """Whitelist domains are the exceptions listed below the marker line."""
+    _, exceptions = _split_whitelist(text)
+    domains, _ = normalize_all(iter_names(exceptions))
+    return domains
+
+
+def render_whitelist(domains, existing_text=""):
+    """Keeps the block-everything preamble and rewrites the exceptions section."""
+    preamble, _ = _split_whitelist(existing_text)
+    lines = preamble + [WHITELIST_MARKER]
+    lines += [f"{SINK_ADDRESS} {domain}" for domain in domains]
+    return "\n".join(lines) + "\n"
+
+
+def parse_list(list_name, text):
+    return parse_blacklist(text) if list_name == "blacklist" else parse_whitelist(text)
+
+
+def render_list(list_name, domains, existing_text=""):
+    if list_name == "blacklist":
+        return render_blacklist(domains)
+    return render_whitelist(domains, existing_text)
@@ -0,0 +1,242 @@
+# hosts_control.py 🧰
+# Qt-free hosts/settings logic shared by the tray, the GUI and the CLI
+
+import os
+import json
+import hashlib
+import logging
+import datetime
+import tempfile
+import subprocess
+from usage_store import record_event, EVENT_BLOCK, EVENT_UNBLOCK
+from snapshot_store import SnapshotStore, LAST_CLEAN, write_bytes_atomic
+from hostlists import is_rendered
+from schedule_spec import cell_active
+
+APP_DIR = "/home/atli/Desktop/Block_python"
+HOSTS_FILE = "/etc/hosts"
+CLEAN_FILE = f"{APP_DIR}/hosts/hosts.clean"
+BLOCKED_FILE = f"{APP_DIR}/hosts/hosts.blocked"
+WHITELIST_FILE = f"{APP_DIR}/hosts/hosts.whitelist"
+# Fixed staging path for rollbacks, so the sudoers rule can allow copying it
+RESTORE_FILE = f"{APP_DIR}/hosts/hosts.restore"
+SETTINGS_FILE = os.path.join(APP_DIR, "settings.json")
+
+MODES = ("blacklist", "whitelist")
+
+
+def load_settings(path=None):
+    """Returns the settings dict, or an empty one if the file is missing."""
+    try:
+        with open(path or SETTINGS_FILE, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_files_atomic(contents):
+    """Writes {path: text} so every file is replaced by a single rename.
+
+    All temp files are written and fsynced before the first rename, so a
+    failure while staging leaves every target untouched. Existing files keep
+    their owner and mode (a run as root must not take over the user's files);
+    new files get 0644.
+    """
+    staged = []
+    try:
+        for path, text in contents.items():
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+            staged.append((tmp, path))
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                os.chmod(tmp, 0o644)
+            else:
+                os.chmod(tmp, st.st_mode & 0o7777)
+                if (st.st_uid, st.st_gid) != (os.geteuid(), os.getegid()):
+                    os.chown(tmp, st.st_uid, st.st_gid)
+        for tmp, path in staged:
+            os.replace(tmp, path)
+    except Exception:
+        for tmp, _ in staged:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        raise
+
+
+def save_settings(data, path=None):
+    write_files_atomic({path or SETTINGS_FILE: json.dumps(data, indent=4)})
+
+
+def get_current_mode():
+    try:
+        with open(SETTINGS_FILE, "r") as f:
+            return json.load(f).get("mode", "blacklist")
+    except:
+        return "blacklist"
+
+
+def get_block_file(mode=None):
+    mode = mode or get_current_mode()
+    return BLOCKED_FILE if mode == "blacklist" else WHITELIST_FILE
+
+
+def has_sudo_privilege():
+    try:
+        subprocess.run(["sudo", "cp", BLOCKED_FILE, HOSTS_FILE],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    except subprocess.CalledProcessError:
+        return False
+
+
+def sha256sum(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to hash file {path}: {e}")
+        return None
+
+
+def is_blocked():
+    return sha256sum(HOSTS_FILE) == sha256sum(get_block_file())
+
+
+def snapshot_pre_apply(src_file, store=None):
+    """Stores the current /etc/hosts and the profile about to replace it.
+
+    A pre-apply state that is not one of our rendered profiles and sinks no
+    names is the system's own hosts file, so it becomes the new last-clean
+    baseline.
+    """
+    store = store or SnapshotStore()
+    with open(HOSTS_FILE, "rb") as f:
+        current = f.read()
+    with open(src_file, "rb") as f:
+        profile = f.read()
+
+    digest = store.put(current, "pre-apply")
+    store.put(profile, "profile", get_current_mode())
+
+    profile_hashes = {sha256sum(BLOCKED_FILE), sha256sum(WHITELIST_FILE)}
+    kinds = store.index["objects"].get(digest, {}).get("kinds", [])
+    rendered = is_rendered(current.decode("utf-8", errors="replace"))
+    if digest not in profile_hashes and "profile" not in kinds and not rendered:
+        store.set_ref(LAST_CLEAN, digest)
+
+
+def refresh_clean_file(store=None):
+    """Rewrites hosts.clean from the last-clean snapshot if it has gone stale."""
+    store = store or SnapshotStore()
+    digest = store.ref(LAST_CLEAN)
+    if digest is None:
+        # First run: seed the baseline from the shipped hosts.clean
+        with open(CLEAN_FILE, "rb") as f:
+            store.set_ref(LAST_CLEAN, store.put(f.read(), "seed"))
+    elif sha256sum(CLEAN_FILE) != digest:
+        store.restore(digest, CLEAN_FILE)
+        logging.debug(f"[DEBUG] ♻️ hosts.clean refreshed from snapshot {digest[:12]}")
+    return store.ref(LAST_CLEAN)
+
+
+def _sudo(prompt):
+    # Scripts pass prompt=False so a missing sudoers rule fails instead of
+    # waiting for a password on stdin
+    return ["sudo"] if prompt else ["sudo", "-n"]
+
+
+def restore_snapshot(digest, interactive=True, store=None, prompt=True):
+    """Puts a stored hosts state back in place of /etc/hosts."""
+    store = store or SnapshotStore()
+    try:
+        store.restore(digest, HOSTS_FILE)
+        return True
+    except OSError as e:
+        # No write access to /etc (or /etc/hosts is a bind mount): fall back to cp
+        if not interactive:
+            logging.error(f"[ERROR] Restore failed: {e}")
+            return False
+    try:
+        write_bytes_atomic(RESTORE_FILE, store.get(digest))
+        subprocess.run(_sudo(prompt) + ["cp", RESTORE_FILE, HOSTS_FILE], check=True)
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.error(f"[ERROR] Restore failed: {e}")
+        return False
+
+
+def block(interactive=True, prompt=True):
+    try:
+        src_file = get_block_file()
+        try:
+            snapshot_pre_apply(src_file)
+        except Exception as e:
+            logging.error(f"[ERROR] Pre-apply snapshot failed: {e}")
+        cmd = _sudo(prompt) + ["cp", src_file, HOSTS_FILE] if interactive else ["cp", src_file, HOSTS_FILE]
+        subprocess.run(cmd, check=True)
+        mode = get_current_mode()
+        logging.debug(f"[DEBUG] ✅ Blocking applied ({mode})")
+        record_event(EVENT_BLOCK, mode)
+        return True
+    except subprocess.CalledProcessError as e:
+        logging.error(f"[ERROR] Blocking failed: {e}")
+        return False
+
+
+def unblock(interactive=True):
+    try:
+        store = SnapshotStore()
+        digest = refresh_clean_file(store)
+    except Exception as e:
+        logging.error(f"[ERROR] Snapshot store unavailable, using hosts.clean as is: {e}")
+        store = digest = None
+
+    try:
+        if interactive or store is None:
+            # The sudoers rule only allows copying hosts.clean itself
+            cmd = ["sudo", "cp", CLEAN_FILE, HOSTS_FILE] if interactive else ["cp", CLEAN_FILE, HOSTS_FILE]
+            subprocess.run(cmd, check=True)
+        elif not restore_snapshot(digest, interactive=False, store=store):
+            subprocess.run(["cp", CLEAN_FILE, HOSTS_FILE], check=True)
+        logging.debug("[DEBUG] ✅ Unblock applied")
+        record_event(EVENT_UNBLOCK)
+        return True
+    except subprocess.CalledProcessError as e:
+        logging.error(f"[ERROR] Unblocking failed: {e}")
+        return False
+
+
+def get_current_schedule_state():
+    try:
+        with open(SETTINGS_FILE, "r") as f:
+            config = json.load(f)
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to load schedule config: {e}")
+        return None
+
+    if not config.get("schedule_enabled", False):
+        return None
+
+    mode = config.get("mode", "blacklist")
+    schedule = config.get("schedule_data", {})
+    # The GUI keeps one grid per mode; older settings files hold a single flat grid
+    if isinstance(schedule.get(mode), dict):
+        schedule = schedule[mode]
+
+    now = datetime.datetime.now()
+    day = now.strftime("%a")
+    hour = now.hour
+    minute = now.minute
+
+    # A half cell covers only the first half of its own hour
+    active = cell_active(schedule.get(f"{day},{hour}", 0), minute)
+
+    if mode == "blacklist":
+        return "block" if active else "unblock"
+    else:
+        return "unblock" if active else "block"
@@ -1,7 +1,7 @@
 #!/bin/bash
 # install_sudoers.sh
 
-SUDOERS_LINE="ALL=(ALL) NOPASSWD: /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.blocked /etc/hosts, /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.clean /etc/hosts"
+SUDOERS_LINE="ALL=(ALL) NOPASSWD: /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.blocked /etc/hosts, /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.whitelist /etc/hosts, /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.clean /etc/hosts, /usr/bin/cp /home/atli/Desktop/Block_python/hosts/hosts.restore /etc/hosts, /usr/sbin/nscd -i hosts, /usr/bin/pkill -HUP -x dnsmasq"
 SUDOERS_FILE="/etc/sudoers.d/focusblocker"
 
 USERNAME=$(logname)  # Get the actual GUI user
@@ -1,8 +1,8 @@
 from debug import print
 import sys
+import time
 import subprocess
-import hashlib
-import json
+import threading
 import datetime
 import os
 from setup_password import (
@@ -10,102 +10,34 @@ from setup_password import (
     reset_password_with_question,
     ensure_password_exists
 )
+from hosts_control import (
+    APP_DIR, HOSTS_FILE, CLEAN_FILE, BLOCKED_FILE, WHITELIST_FILE, SETTINGS_FILE,
+    get_current_mode, get_block_file, has_sudo_privilege, sha256sum,
+    is_blocked, block, unblock, get_current_schedule_state
+)
+from usage_store import (
+    record_event,
+    EVENT_TOGGLE, EVENT_UNBLOCK_ATTEMPT, EVENT_OVERRIDE,
+    EVENT_SCHEDULE_BLOCK, EVENT_SCHEDULE_UNBLOCK
+)
+from profiling import HandlerProfiler, profiling_requested
+from resolver_cache import post_apply
 from PyQt5.QtWidgets import (
     QApplication, QSystemTrayIcon, QMenu, QAction, QWidget,
     QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QMessageBox, QInputDialog
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QTimer, Qt
-
-APP_DIR = "/home/atli/Desktop/Block_python"
-HOSTS_FILE = "/etc/hosts"
-CLEAN_FILE = f"{APP_DIR}/hosts/hosts.clean"
-BLOCKED_FILE = f"{APP_DIR}/hosts/hosts.blocked"
-WHITELIST_FILE = f"{APP_DIR}/hosts/hosts.whitelist"
-SETTINGS_FILE = os.path.join(APP_DIR, "settings.json")
+from PyQt5.QtCore import QTimer, Qt, QObject, pyqtSignal
 
 ICON_PATHS = {
     "blocked": f"{APP_DIR}/icons/face-smile.png",
     "unblocked": f"{APP_DIR}/icons/face-angry.png"
 }
 
-def get_current_mode():
-    try:
-        with open(SETTINGS_FILE, "r") as f:
-            return json.load(f).get("mode", "blacklist")
-    except:
-        return "blacklist"
-
-def get_block_file():
-    mode = get_current_mode()
-    return BLOCKED_FILE if mode == "blacklist" else WHITELIST_FILE
-
-def has_sudo_privilege():
-    try:
-        subprocess.run(["sudo", "cp", BLOCKED_FILE, HOSTS_FILE],
-                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except subprocess.CalledProcessError:
-        return False
-
-def sha256sum(path):
-    try:
-        with open(path, "rb") as f:
-            return hashlib.sha256(f.read()).hexdigest()
-    except Exception as e:
-        print(f"[ERROR] Failed to hash file {path}: {e}")
-        return None
-
-def is_blocked():
-    return sha256sum(HOSTS_FILE) == sha256sum(get_block_file())
-
-def block(interactive=True):
-    try:
-        src_file = get_block_file()
-        cmd = ["sudo", "cp", src_file, HOSTS_FILE] if interactive else ["cp", src_file, HOSTS_FILE]
-        subprocess.run(cmd, check=True)
-        print(f"[DEBUG] ✅ Blocking applied ({get_current_mode()})")
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Blocking failed: {e}")
-
-def unblock(interactive=True):
-    try:
-        cmd = ["sudo", "cp", CLEAN_FILE, HOSTS_FILE] if interactive else ["cp", CLEAN_FILE, HOSTS_FILE]
-        subprocess.run(cmd, check=True)
-        print("[DEBUG] ✅ Unblock applied")
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Unblocking failed: {e}")
-
-def get_current_schedule_state():
-    try:
-        with open(SETTINGS_FILE, "r") as f:
-            config = json.load(f)
-    except Exception as e:
-        print(f"[ERROR] Failed to load schedule config: {e}")
-        return None
-
-    if not config.get("schedule_enabled", False):
-        return None
-
-    mode = config.get("mode", "blacklist")
-    schedule = config.get("schedule_data", {})
-
-    now = datetime.datetime.now()
-    day = now.strftime("%a")
-    hour = now.hour
-    minute = now.minute
-
-    def get_state(h):
-        return schedule.get(f"{day},{h}", 0)
-
-    current = get_state(hour)
-    prev = get_state(hour - 1) if hour > 0 else 0
-
-    if mode == "blacklist":
-        return "block" if current == 1 or (current == 2 and minute < 30) or (prev == 2 and minute >= 30) else "unblock"
-    else:
-        return "unblock" if current == 1 or (current == 2 and minute < 30) or (prev == 2 and minute >= 30) else "block"
+class EnforcementSignals(QObject):
+    # Emitted from the verification thread; delivered on the UI thread
+    finished = pyqtSignal(int, dict)
 
 class FocusTrayApp:
     def __init__(self):
@@ -117,6 +49,16 @@ class FocusTrayApp:
         self.anchor.setWindowFlags(Qt.Tool)
         self.anchor.hide()
 
+        # Opt-in profiling of timer and menu handlers (FOCUS_PROFILE=1 or --profile)
+        self.profiler = HandlerProfiler() if profiling_requested() else None
+        if self.profiler:
+            print("[DEBUG] 🔬 Profiling tray handlers")
+            self.toggle = self.profiler.wrap(self.toggle)
+            self.open_settings = self.profiler.wrap(self.open_settings)
+            self.check_schedule = self.profiler.wrap(self.check_schedule)
+            self.handle_tray_click = self.profiler.wrap(self.handle_tray_click)
+            self.update_icon = self.profiler.wrap(self.update_icon)
+
         self.tray = QSystemTrayIcon()
         self.menu = QMenu()
 
@@ -126,8 +68,11 @@ class FocusTrayApp:
         self.settings_action = QAction("⚙️ Settings")
         self.settings_action.triggered.connect(self.open_settings)
 
+        reset_password = lambda: reset_password_with_question(self.anchor)
+        if self.profiler:
+            reset_password = self.profiler.wrap(reset_password, "reset_password_with_question")
         self.change_pass_action = QAction("🔑 Reset Password")
-        self.change_pass_action.triggered.connect(lambda: QTimer.singleShot(0, lambda: reset_password_with_question(self.anchor)))
+        self.change_pass_action.triggered.connect(lambda: QTimer.singleShot(0, reset_password))
 
         self.quit_action = QAction("❌ Quit")
         self.quit_action.triggered.connect(self.app.quit)
@@ -143,6 +88,16 @@ class FocusTrayApp:
         self.menu.addSeparator()
         self.menu.addAction(self.quit_action)
 
+        # Blocking only counts as ON once probes confirm it took effect. Each check
+        # carries a generation so reports from superseded checks are dropped.
+        self.enforcement = None
+        self.enforcement_generation = 0
+        self.enforcement_thread = None
+        self.enforcement_hash = None     # /etc/hosts content the state refers to
+        self.enforcement_started = None  # when that content was applied
+        self.enforcement_signals = EnforcementSignals()
+        self.enforcement_signals.finished.connect(self.on_enforcement_checked)
+
         self.tray.setContextMenu(self.menu)
         self.tray.activated.connect(self.handle_tray_click)
         self.update_icon()
@@ -157,16 +112,31 @@ class FocusTrayApp:
     def toggle(self):
         if is_blocked():
             print("[DEBUG] 🔓 Attempting unblock...")
+            record_event(EVENT_UNBLOCK_ATTEMPT)
             password, ok = QInputDialog.getText(
                 self.anchor, "Unblock", "Enter password:", QLineEdit.Password
             )
             if not ok or not check_password(password):
                 print("[DEBUG] ❌ Invalid password")
                 return
-            unblock()
+            if not unblock():
+                self.update_icon()
+                return
+            self.reset_enforcement()
+            action = "unblock"
         else:
             print("[DEBUG] ✅ Toggling block")
-            block()
+            if not self.apply_block():
+                self.update_icon()
+                return
+            action = "block"
+        # Only toggles that actually changed /etc/hosts count in the rollups
+        record_event(EVENT_TOGGLE, action)
+
+        # Toggling against what the schedule currently wants counts as an override
+        scheduled = get_current_schedule_state()
+        if scheduled is not None and scheduled != action:
+            record_event(EVENT_OVERRIDE, action)
         self.update_icon()
 
     def open_settings(self):
@@ -189,25 +159,88 @@ class FocusTrayApp:
         else:
             QMessageBox.warning(self.anchor, "Access Denied", "Incorrect password.")
 
+    def apply_block(self):
+        started = time.monotonic()
+        if not block():
+            return False
+        self.verify_enforcement(started)
+        return True
+
+    def verify_enforcement(self, started=None):
+        # Cache flush + probing can take seconds, so it runs off the UI thread
+        self.enforcement = "pending"
+        self.enforcement_generation += 1
+        self.enforcement_hash = sha256sum(HOSTS_FILE)
+        # Re-checks keep measuring time to effect from the original apply
+        if started is None:
+            started = self.enforcement_started or time.monotonic()
+        self.enforcement_started = started
+        generation = self.enforcement_generation
+
+        def worker():
+            report = post_apply(HOSTS_FILE, started=started)
+            self.enforcement_signals.finished.emit(generation, report)
+
+        self.enforcement_thread = threading.Thread(target=worker, name="enforcement-check", daemon=True)
+        self.enforcement_thread.start()
+
+    def reset_enforcement(self):
+        self.enforcement = None
+        self.enforcement_generation += 1
+        self.enforcement_hash = None
+        self.enforcement_started = None
+
+    def on_enforcement_checked(self, generation, report):
+        if generation != self.enforcement_generation:
+            return  # unblocked or re-checked while this check was running
+        self.enforcement = "effective" if report["effective"] else "not effective"
+        print(f"[DEBUG] 🎯 Enforcement: {self.enforcement} (time to effect: {report['time_to_effect']}s)")
+        self.update_icon()
+
     def update_icon(self):
-        icon = QIcon(ICON_PATHS["blocked" if is_blocked() else "unblocked"])
+        blocked = is_blocked()
+        # A different block file (e.g. a CLI re-apply) needs its own check
+        if blocked and self.enforcement is not None and sha256sum(HOSTS_FILE) != self.enforcement_hash:
+            self.reset_enforcement()
+        # Blocks applied outside the tray (CLI, rollback, --check) still need verifying
+        if blocked and self.enforcement is None:
+            self.verify_enforcement()
+        elif not blocked and self.enforcement is not None:
+            self.reset_enforcement()
+        icon = QIcon(ICON_PATHS["blocked" if blocked else "unblocked"])
         self.tray.setIcon(icon)
         mode = get_current_mode().upper()
-        self.tray.setToolTip(f"Focus Mode: {mode} — {'ON' if is_blocked() else 'OFF'}")
+        if not blocked:
+            status = "OFF"
+        elif self.enforcement == "effective":
+            status = "ON"
+        elif self.enforcement == "pending":
+            status = "APPLYING…"
+        else:
+            status = "NOT EFFECTIVE YET"
+        self.tray.setToolTip(f"Focus Mode: {mode} — {status}")
 
     def check_schedule(self):
+        # Caches may have expired since the last probe timed out
+        if self.enforcement == "not effective" and is_blocked():
+            self.verify_enforcement()
+
         now = datetime.datetime.now()
         if now.minute not in [0, 30]:
             print(f"[DEBUG] ⏭ Skipping schedule check at {now.strftime('%H:%M')}")
+            self.update_icon()  # still pick up blocks/unblocks made outside the tray
             return
 
         state = get_current_schedule_state()
         print(f"[DEBUG] 📅 Schedule says: {state}")
 
         if state == "block" and not is_blocked():
-            block()
+            if self.apply_block():
+                record_event(EVENT_SCHEDULE_BLOCK)
         elif state == "unblock" and is_blocked():
-            unblock()
+            if unblock():
+                self.reset_enforcement()
+                record_event(EVENT_SCHEDULE_UNBLOCK)
 
         self.update_icon()
 
@@ -224,6 +257,9 @@ if __name__ == "__main__":
         app = QApplication(sys.argv)
         tray = FocusTrayApp()
         tray.check_schedule()
+        # The probe thread is a daemon; let it record its result before exiting
+        if tray.enforcement_thread:
+            tray.enforcement_thread.join()
         sys.exit()
 
     elif "--settings" in sys.argv:
@@ -0,0 +1,82 @@
+# profiling.py 🔬
+# Opt-in cProfile + tracemalloc around tray handlers (FOCUS_PROFILE=1 or --profile)
+
+import os
+import sys
+import json
+import time
+import atexit
+import pstats
+import logging
+import cProfile
+import functools
+import tracemalloc
+
+APP_DIR = "/home/atli/Desktop/Block_python"
+LOG_DIR = os.path.join(APP_DIR, "logs")
+PROFILE_ENV = "FOCUS_PROFILE"
+
+
+def profiling_requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes") or "--profile" in argv
+
+
+class HandlerProfiler:
+    """Profiles wrapped handlers and dumps the stats to logs/ when the app exits."""
+
+    def __init__(self, log_dir=LOG_DIR):
+        self.log_dir = log_dir
+        self.profile = cProfile.Profile()
+        self.handlers = {}
+        self._depth = 0
+        tracemalloc.start()
+        atexit.register(self.dump)
+
+    def wrap(self, fn, name=None):
+        name = name or getattr(fn, "__qualname__", repr(fn))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stats = self.handlers.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+            # Nested handlers (e.g. toggle -> update_icon) stay in the outer profile run
+            outer = self._depth == 0
+            if outer:
+                tracemalloc.reset_peak()
+                self.profile.enable()
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                stats["calls"] += 1
+                stats["seconds"] += time.perf_counter() - start
+                if outer:
+                    self.profile.disable()
+                    stats["peak_bytes"] = max(stats["peak_bytes"], tracemalloc.get_traced_memory()[1])
+
+        return wrapper
+
+    def dump(self):
+        if not self.handlers:
+            return
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            base = os.path.join(self.log_dir, f"profile-{stamp}")
+
+            self.profile.dump_stats(base + ".prof")
+            with open(base + ".txt", "w") as f:
+                stats = pstats.Stats(self.profile, stream=f)
+                stats.sort_stats("cumulative").print_stats(40)
+
+                f.write("\nTop allocations (tracemalloc)\n")
+                for stat in tracemalloc.take_snapshot().statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+
+            with open(base + ".json", "w") as f:
+                json.dump(self.handlers, f, indent=2)
+            logging.debug(f"[DEBUG] 🔬 Profile written to {base}.*")
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to write profile: {e}")
@@ -0,0 +1,177 @@
+# resolver_cache.py 🧹
+# Post-apply stage: flush local resolver caches, then probe blocked names until
+# they resolve to the sink address so we know blocking has actually taken effect.
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import logging
+import argparse
+import subprocess
+from usage_store import record_event, EVENT_EFFECT
+from hostlists import WHITELIST_MARKER, sink_entries
+
+HOSTS_FILE = "/etc/hosts"
+
+
+def _process_running(name):
+    """True if a process with this exact comm name is running (Linux /proc scan)."""
+    try:
+        pids = [p for p in os.listdir("/proc") if p.isdigit()]
+    except OSError:
+        return False
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/comm", "r") as f:
+                if f.read().strip() == name:
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+class CacheFlusher:
+    """One local DNS cache: how to detect it and the command that flushes it."""
+
+    def __init__(self, name, command, detect, needs_root=True):
+        self.name = name
+        self.command = command
+        self.detect = detect
+        self.needs_root = needs_root
+
+    def present(self):
+        try:
+            return bool(shutil.which(self.command[0])) and self.detect()
+        except OSError:
+            return False
+
+    def flush(self, dry_run=False, runner=subprocess.run):
+        cmd = list(self.command)
+        if self.needs_root and os.geteuid() != 0:
+            cmd = ["sudo", "-n"] + cmd
+        result = {"name": self.name, "command": cmd, "dry_run": dry_run, "ok": True}
+        if dry_run:
+            return result
+        try:
+            runner(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=10)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            result["ok"] = False
+            result["error"] = str(e)
+            logging.error(f"[ERROR] Failed to flush {self.name}: {e}")
+        return result
+
+
+FLUSHERS = [
+    CacheFlusher(
+        "systemd-resolved", ["resolvectl", "flush-caches"],
+        lambda: os.path.isdir("/run/systemd/resolve"),
+        needs_root=False,  # allowed for the desktop user via polkit
+    ),
+    CacheFlusher(
+        "nscd", ["nscd", "-i", "hosts"],
+        lambda: any(os.path.exists(p) for p in ("/run/nscd/nscd.pid", "/var/run/nscd/nscd.pid")),
+    ),
+    # SIGHUP makes dnsmasq clear its cache and re-read /etc/hosts
+    CacheFlusher("dnsmasq", ["pkill", "-HUP", "-x", "dnsmasq"], lambda: _process_running("dnsmasq")),
+]
+
+
+def detect_caches(flushers=None):
+    return [f for f in (flushers or FLUSHERS) if f.present()]
+
+
+def flush_caches(dry_run=False, flushers=None, runner=subprocess.run):
+    return [f.flush(dry_run=dry_run, runner=runner) for f in detect_caches(flushers)]
+
+
+def sample_blocked_names(hosts_path=HOSTS_FILE, limit=5):
+    """Returns up to `limit` {name: sink} entries spread evenly across the hosts file.
+
+    In a whitelist file everything below the exceptions marker is allowed,
+    so only the part above it is sampled.
+    """
+    try:
+        with open(hosts_path, "r") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        logging.error(f"[ERROR] Failed to read {hosts_path}: {e}")
+        return {}
+    if WHITELIST_MARKER in lines:
+        lines = lines[:lines.index(WHITELIST_MARKER)]
+    entries = list(sink_entries(lines))
+    step = max(1, len(entries) // limit) if limit else 1
+    return dict(entries[::step][:limit])
+
+
+def resolves_to(name, sink, resolver=socket.getaddrinfo):
+    try:
+        infos = resolver(name, None, socket.AF_INET, socket.SOCK_STREAM)
+    except (socket.gaierror, OSError, UnicodeError):
+        return False
+    addresses = {info[4][0] for info in infos}
+    return addresses == {sink}
+
+
+def probe(names, resolver=socket.getaddrinfo, timeout=10.0, interval=0.25,
+          clock=time.monotonic, sleep=time.sleep):
+    """Polls until every name resolves to its sink, or the timeout passes.
+
+    Returns (pending_names, seconds_waited).
+    """
+    start = clock()
+    pending = dict(names)
+    while True:
+        pending = {n: sink for n, sink in pending.items() if not resolves_to(n, sink, resolver)}
+        elapsed = clock() - start
+        if not pending or elapsed >= timeout:
+            return sorted(pending), elapsed
+        sleep(interval)
+
+
+def post_apply(hosts_path=HOSTS_FILE, started=None, dry_run=False, sample=5, timeout=10.0,
+               resolver=socket.getaddrinfo, flushers=None, runner=subprocess.run, record=True):
+    """Flushes detected caches, then verifies enforcement by probing blocked names.
+
+    `started` is the time.monotonic() value taken before the hosts file was
+    copied; time_to_effect is measured from there.
+    """
+    started = started if started is not None else time.monotonic()
+    flushed = flush_caches(dry_run=dry_run, flushers=flushers, runner=runner)
+    names = sample_blocked_names(hosts_path, sample)
+    pending, _ = probe(names, resolver=resolver, timeout=0 if dry_run else timeout)
+    effective = not pending
+    report = {
+        "flushed": flushed,
+        "probed": sorted(names),
+        "pending": pending,
+        "effective": effective,
+        "time_to_effect": round(time.monotonic() - started, 3) if effective else None,
+    }
+    if effective:
+        logging.debug(f"[DEBUG] 🎯 Blocking effective after {report['time_to_effect']}s")
+    else:
+        logging.error(f"[ERROR] Blocking not effective yet for: {', '.join(pending)}")
+    if record and not dry_run:
+        record_event(EVENT_EFFECT, {"effective": effective, "seconds": report["time_to_effect"]})
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flush local DNS caches and verify blocking")
+    parser.add_argument("--dry-run", action="store_true", help="show what would be flushed")
+    parser.add_argument("--hosts", default=HOSTS_FILE, help="hosts file to sample names from")
+    parser.add_argument("--sample", type=int, default=5, help="number of names to probe")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds to wait for effect")
+    args = parser.parse_args(argv)
+
+    report = post_apply(args.hosts, dry_run=args.dry_run, sample=args.sample, timeout=args.timeout)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["effective"] or args.dry_run else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
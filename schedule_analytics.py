@@ -0,0 +1,138 @@
+# schedule_analytics.py 📈
+# Vectorized schedule analytics: every profile's grid becomes a
+# (profile x day x minute) boolean array, so coverage, overlap/conflict masks
+# and upcoming transitions are plain NumPy reductions.
+
+import datetime
+import numpy as np
+from schedule_spec import DAYS, EMPTY, FULL, HALF, cell_active
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = MINUTES_PER_DAY * len(DAYS)
+MAX_RANGES = 20  # conflict ranges spelled out in a report
+
+# Which minutes of its hour each cell state covers, taken from the same
+# cell_active() the enforcement path uses so both always agree
+_STATE_MINUTES = np.array([[cell_active(state, minute) for minute in range(60)]
+                           for state in (EMPTY, FULL, HALF)], dtype=bool)
+_CELL_KEYS = [(d, f"{day},{hour}") for d, day in enumerate(DAYS) for hour in range(24)]
+
+
+def grid_states(grids):
+    """Stacks {"Mon,9": state, ...} grids into an int8 array of shape (P, 7, 24)."""
+    states = np.zeros((len(grids), len(DAYS) * 24), dtype=np.int8)
+    for p, grid in enumerate(grids):
+        states[p] = [grid.get(key, 0) for _, key in _CELL_KEYS]
+    return states.reshape(len(grids), len(DAYS), 24)
+
+
+def minute_masks(states):
+    """(P, 7, 24) cell states -> (P, 7, 1440) bool, True where the cell is painted."""
+    known = (states >= EMPTY) & (states <= HALF)  # anything else is inactive, as in cell_active
+    masks = _STATE_MINUTES[np.where(known, states, EMPTY)]
+    return masks.reshape(*states.shape[:2], MINUTES_PER_DAY)
+
+
+def blocking_masks(masks, modes):
+    """Painted cells mean "block" in blacklist mode and "allow" in whitelist mode."""
+    invert = np.array([mode == "whitelist" for mode in modes]).reshape(-1, 1, 1)
+    return masks ^ invert
+
+
+def coverage_hours(masks):
+    return masks.reshape(len(masks), -1).sum(axis=1) / 60
+
+
+def overlap_hours(masks):
+    """(P, P) matrix of hours per week painted in both profiles' schedules."""
+    flat = masks.reshape(len(masks), -1).astype(np.float32)
+    return flat @ flat.T / 60
+
+
+def hourly_heatmap(mask):
+    """(7, 1440) mask -> (7, 24) fraction of each hour that is set."""
+    return mask.reshape(len(DAYS), 24, 60).mean(axis=2)
+
+
+def week_minute(when):
+    return when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+def _format_minute(minute):
+    day, rest = divmod(int(minute) % MINUTES_PER_WEEK, MINUTES_PER_DAY)
+    return f"{DAYS[day]} {rest // 60:02d}:{rest % 60:02d}"
+
+
+def mask_runs(mask):
+    """(starts, ends) week-minute arrays of every contiguous run in a weekly mask."""
+    flat = np.asarray(mask, dtype=bool).reshape(-1)
+    edges = np.diff(np.concatenate(([False], flat, [False])).astype(np.int8))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def mask_ranges(mask, limit=None):
+    """Turns a weekly mask into readable ranges like "Mon 09:00 - Mon 17:00"."""
+    starts, ends = mask_runs(mask)
+    return [f"{_format_minute(s)} - {_format_minute(e)}" for s, e in zip(starts[:limit], ends[:limit])]
+
+
+def next_transitions(mask, now=None, count=5):
+    """The next `count` times the weekly (7, 1440) mask flips, as (datetime, new_value)."""
+    now = (now or datetime.datetime.now()).replace(second=0, microsecond=0)
+    start = week_minute(now)
+    rolled = np.roll(np.asarray(mask, dtype=bool).reshape(-1), -start)
+    # Look one full week ahead (plus the wrap back to now)
+    ahead = np.concatenate((rolled, rolled[:1]))
+    changes = np.flatnonzero(ahead[1:] != ahead[:-1])[:count] + 1
+    return [(now + datetime.timedelta(minutes=int(offset)), bool(ahead[offset])) for offset in changes]
+
+
+def analyze(schedules, modes, active=None, now=None, transitions=5):
+    """Coverage, overlap and conflicts for {name: grid} schedules.
+
+    `modes` maps each name to "blacklist"/"whitelist"; `active` names the
+    profile whose upcoming transitions should be listed.
+    """
+    names = list(schedules)
+    mode_list = [modes[name] for name in names]
+    masks = minute_masks(grid_states([schedules[name] for name in names]))
+    blocking = blocking_masks(masks, mode_list)
+    scheduled = coverage_hours(masks)
+    blocked = coverage_hours(blocking)
+    overlaps = overlap_hours(masks)
+
+    result = {
+        "profiles": {
+            name: {
+                "mode": mode_list[i],
+                "scheduled_hours": float(scheduled[i]),
+                "blocking_hours": float(blocked[i]),
+            }
+            for i, name in enumerate(names)
+        },
+    }
+
+    # A blacklist and a whitelist painted at the same time pull in opposite directions
+    is_white = np.array([mode == "whitelist" for mode in mode_list], dtype=bool)
+    first, second = np.triu_indices(len(names), k=1)
+    hours = overlaps[first, second]
+    conflict = is_white[first] != is_white[second]
+    keep = np.flatnonzero(hours > 0)
+    result["overlaps"] = [
+        {"profiles": [names[first[k]], names[second[k]]], "hours": float(hours[k]),
+         "conflict": bool(conflict[k])}
+        for k in keep
+    ]
+
+    conflict_mask = masks[~is_white].any(axis=0) & masks[is_white].any(axis=0)
+    result["conflict_hours"] = float(conflict_mask.sum() / 60)
+    result["conflict_ranges"] = mask_ranges(conflict_mask, MAX_RANGES)
+    result["conflict_ranges_total"] = len(mask_runs(conflict_mask)[0])
+
+    if active in schedules:
+        idx = names.index(active)
+        result["next_transitions"] = [
+            {"at": when.isoformat(timespec="minutes"), "state": "block" if value else "unblock"}
+            for when, value in next_transitions(blocking[idx], now, transitions)
+        ]
+    return result
@@ -0,0 +1,102 @@
+# schedule_spec.py 🗓️
+# Range syntax ("Mon-Fri 09:00-17:00") <-> the 7x24 schedule grid in settings.json
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+SLOTS_PER_DAY = 48  # half-hour resolution, like the grid's full/half cells
+SLOTS_PER_WEEK = SLOTS_PER_DAY * len(DAYS)
+
+# Grid cell states (see ScheduleCell): 0 empty, 1 full hour, 2 first half-hour
+EMPTY, FULL, HALF = 0, 1, 2
+HALF_MINUTES = 30
+
+
+def cell_active(state, minute):
+    """Whether a cell with this state covers `minute` (0-59) of its own hour."""
+    return state == FULL or (state == HALF and minute < HALF_MINUTES)
+
+
+def _parse_days(text):
+    if text.lower() in ("daily", "all", "*"):
+        return list(range(len(DAYS)))
+    lookup = {day.lower(): i for i, day in enumerate(DAYS)}
+    days = []
+    for part in text.split(","):
+        ends = part.split("-")
+        try:
+            first, last = lookup[ends[0].lower()], lookup[ends[-1].lower()]
+        except KeyError:
+            raise ValueError(f"unknown day in {text!r} (use Mon..Sun)")
+        if len(ends) > 2:
+            raise ValueError(f"bad day range {part!r}")
+        # Ranges may wrap around the week, e.g. Sat-Mon
+        span = (last - first) % len(DAYS)
+        days += [(first + i) % len(DAYS) for i in range(span + 1)]
+    return days
+
+
+def _parse_time(text):
+    try:
+        hour, minute = (int(x) for x in text.split(":"))
+    except ValueError:
+        raise ValueError(f"bad time {text!r} (use HH:MM)")
+    if minute not in (0, 30) or not 0 <= hour <= 24 or (hour == 24 and minute):
+        raise ValueError(f"bad time {text!r}: the schedule has half-hour resolution")
+    return hour * 2 + minute // 30
+
+
+def parse_range(spec):
+    """Returns the set of week slots covered by e.g. 'Mon-Fri 09:00-12:00,13:00-17:00'.
+
+    An end time at or before the start time runs past midnight into the next day.
+    """
+    parts = spec.split()
+    if len(parts) != 2:
+        raise ValueError(f"bad schedule range {spec!r} (expected 'DAYS HH:MM-HH:MM')")
+    days, times = parts
+    slots = set()
+    for window in times.split(","):
+        try:
+            start_text, end_text = window.split("-")
+        except ValueError:
+            raise ValueError(f"bad time window {window!r} (expected HH:MM-HH:MM)")
+        start, end = _parse_time(start_text), _parse_time(end_text)
+        if end <= start:
+            end += SLOTS_PER_DAY
+        for day in _parse_days(days):
+            base = day * SLOTS_PER_DAY
+            slots.update((base + s) % SLOTS_PER_WEEK for s in range(start, end))
+    return slots
+
+
+def grid_to_slots(grid):
+    slots = set()
+    for key, state in grid.items():
+        try:
+            day, hour = key.split(",")
+            base = DAYS.index(day) * SLOTS_PER_DAY + int(hour) * 2
+        except ValueError:
+            continue
+        if state == FULL:
+            slots.update((base, base + 1))
+        elif state == HALF:
+            slots.add(base)
+    return slots
+
+
+def slots_to_grid(slots):
+    """Converts week slots back into a full 168-cell grid dict.
+
+    Raises ValueError for a lone second half-hour, which the grid cannot show.
+    """
+    grid = {}
+    for d, day in enumerate(DAYS):
+        for hour in range(24):
+            base = d * SLOTS_PER_DAY + hour * 2
+            first, second = base in slots, base + 1 in slots
+            if second and not first:
+                raise ValueError(
+                    f"{day} {hour:02d}:30-{hour + 1:02d}:00 cannot be scheduled on its own; "
+                    "half-hour cells cover the first half of the hour"
+                )
+            grid[f"{day},{hour}"] = FULL if first and second else HALF if first else EMPTY
+    return grid
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel, QHBoxLayout, QVBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QPolygonF
 
 DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
@@ -10,10 +10,14 @@ class ScheduleCell(QWidget):
         super().__init__(parent)
         self.setFixedSize(25, 25)
         self.state = 0   # 0: empty; 1: full; 2: half
+        self.heat = 0.0  # 0..1 analytics overlay intensity
+        self.grid = parent  # the layout reparents cells, so keep the grid itself
 
     def mousePressEvent(self, event):
         self.state = (self.state + 1) % 3
         self.update()
+        if self.grid is not None:
+            self.grid.schedule_changed.emit()
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -37,7 +41,15 @@ class ScheduleCell(QWidget):
             triangle = QPolygonF([r.topLeft(), r.topRight(), r.bottomRight()])
             painter.drawPolygon(triangle)
 
+        # Heatmap overlay on top of the cell's own state
+        if self.heat > 0:
+            painter.setBrush(QBrush(QColor(255, 140, 0, int(40 + 140 * min(self.heat, 1.0)))))
+            painter.drawRect(r)
+
 class ScheduleGridWidget(QWidget):
+    # Emitted when the user clicks a cell (not for set_schedule/clear_all)
+    schedule_changed = pyqtSignal()
+
     def __init__(self, mode="blacklist", parent=None):
         super().__init__(parent)
         self.setFixedSize(800, 300)
@@ -109,6 +121,12 @@ class ScheduleGridWidget(QWidget):
             except Exception:
                 continue
 
+    def set_heatmap(self, values=None):
+        """Overlays values[day_index][hour] in 0..1 on the grid; None clears it."""
+        for (day, hour), cell in self.cells.items():
+            cell.heat = float(values[DAYS.index(day)][hour]) if values is not None else 0.0
+            cell.update()
+
     def set_mode(self, mode):
         self.mode = mode
         for cell in self.cells.values():
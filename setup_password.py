@@ -5,6 +5,7 @@ import bcrypt
 import json
 import time
 from PyQt5.QtWidgets import QInputDialog, QMessageBox, QLineEdit, QWidget
+from usage_store import record_event, EVENT_PASSWORD_OK, EVENT_PASSWORD_FAIL
 
 APP_DIR = "/home/atli/Desktop/Block_python"
 PASSWORD_FILE = os.path.join(APP_DIR, "password.hash")
@@ -37,6 +38,7 @@ def check_password(password: str) -> bool:
         if time_since < LOCKOUT_SECONDS:
             remaining = int(LOCKOUT_SECONDS - time_since)
             print(f"[DEBUG] ⏳ Too many attempts — cooldown {remaining}s remaining")
+            record_event(EVENT_PASSWORD_FAIL, "cooldown")
             return False
         else:
             print("[DEBUG] 🔄 Cooldown expired — resetting attempts")
@@ -49,11 +51,13 @@ def check_password(password: str) -> bool:
         if bcrypt.checkpw(password.encode(), stored_hash):
             print("[DEBUG] ✅ Password match")
             FAILED_ATTEMPTS = 0
+            record_event(EVENT_PASSWORD_OK)
             return True
         else:
             FAILED_ATTEMPTS += 1
             LAST_FAIL_TIME = time.time()
             print(f"[DEBUG] ❌ Password mismatch — failed attempts: {FAILED_ATTEMPTS}")
+            record_event(EVENT_PASSWORD_FAIL, "mismatch")
             return False
     except Exception as e:
         print(f"[ERROR] Exception during password check: {e}")
@@ -0,0 +1,185 @@
+# snapshot_store.py 🗃️
+# Content-addressed store for /etc/hosts states: sha256-named, deduplicated,
+# zlib-compressed objects, a "last_clean" pointer and LRU garbage collection.
+
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import tempfile
+
+APP_DIR = "/home/atli/Desktop/Block_python"
+STORE_DIR = os.path.join(APP_DIR, "hosts", "store")
+
+MAX_OBJECT_BYTES = 8 * 1024 * 1024    # refuse to snapshot anything bigger (uncompressed)
+MAX_STORE_BYTES = 32 * 1024 * 1024    # compressed total kept before LRU eviction
+MAX_HISTORY = 500
+
+LAST_CLEAN = "last_clean"
+
+
+def write_bytes_atomic(path, data, mode=0o644, owner=None):
+    """Writes to a temp file next to `path`, then renames it into place.
+
+    An existing file keeps its owner and mode; a new one gets `mode` and,
+    if given, the (uid, gid) `owner`.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            os.chmod(tmp, mode)
+        else:
+            os.chmod(tmp, st.st_mode & 0o7777)
+            owner = (st.st_uid, st.st_gid)
+        if owner and owner != (os.geteuid(), os.getegid()):
+            os.chown(tmp, *owner)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class SnapshotStore:
+    def __init__(self, root=None, max_bytes=MAX_STORE_BYTES):
+        self.root = root or STORE_DIR
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.root, "index.json")
+        self.owner = self._parent_owner()
+        self._makedirs(os.path.join(self.root, "objects"))
+        self.index = self._load_index()
+
+    def _parent_owner(self):
+        """(uid, gid) for new store files when running as root, so the user's
+        tray can keep writing to a store a root CLI run created."""
+        if os.geteuid() != 0:
+            return None
+        st = os.stat(os.path.dirname(os.path.abspath(self.root)))
+        return st.st_uid, st.st_gid
+
+    def _makedirs(self, path):
+        if os.path.isdir(path):
+            return
+        self._makedirs(os.path.dirname(path))
+        os.makedirs(path, exist_ok=True)
+        if self.owner and self.owner != (os.geteuid(), os.getegid()):
+            os.chown(path, *self.owner)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        index.setdefault("objects", {})
+        index.setdefault("refs", {})
+        index.setdefault("history", [])
+        return index
+
+    def _save_index(self):
+        write_bytes_atomic(self.index_path, json.dumps(self.index, indent=1).encode(), owner=self.owner)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def contains(self, digest):
+        return digest in self.index["objects"]
+
+    def put(self, data, kind, label=None):
+        """Stores `data` (bytes) and appends a history entry; returns its sha256."""
+        if len(data) > MAX_OBJECT_BYTES:
+            raise ValueError(f"snapshot too large ({len(data)} bytes > {MAX_OBJECT_BYTES})")
+
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        meta = self.index["objects"].get(digest)
+        if meta is None or not os.path.exists(self._object_path(digest)):
+            path = self._object_path(digest)
+            self._makedirs(os.path.dirname(path))
+            packed = zlib.compress(data, 6)
+            write_bytes_atomic(path, packed, owner=self.owner)
+            meta = {"size": len(data), "stored": len(packed), "kinds": []}
+            self.index["objects"][digest] = meta
+        meta["last_used"] = now
+        if kind not in meta["kinds"]:
+            meta["kinds"].append(kind)
+
+        # Consecutive identical entries (e.g. re-applying the same profile) collapse
+        history = self.index["history"]
+        if not history or history[-1]["hash"] != digest or history[-1]["kind"] != kind:
+            history.append({"ts": now, "kind": kind, "hash": digest, "label": label})
+            del history[:-MAX_HISTORY]
+        else:
+            history[-1]["ts"] = now
+
+        self.gc(save=False)
+        self._save_index()
+        return digest
+
+    def get(self, digest):
+        with open(self._object_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"snapshot {digest[:12]} is corrupt")
+        self.index["objects"][digest]["last_used"] = time.time()
+        self._save_index()
+        return data
+
+    def set_ref(self, name, digest):
+        if self.index["refs"].get(name) != digest:
+            self.index["refs"][name] = digest
+            self._save_index()
+
+    def ref(self, name):
+        return self.index["refs"].get(name)
+
+    def resolve(self, spec):
+        """Accepts a ref name (e.g. last_clean), a full hash or a unique hash prefix."""
+        if spec in self.index["refs"]:
+            return self.index["refs"][spec]
+        matches = [d for d in self.index["objects"] if d.startswith(spec.lower())]
+        if len(matches) != 1:
+            raise KeyError(f"{'no' if not matches else 'ambiguous'} snapshot matching {spec!r}")
+        return matches[0]
+
+    def history(self, limit=None):
+        entries = list(reversed(self.index["history"]))
+        return entries[:limit] if limit else entries
+
+    def restore(self, digest, target):
+        """Puts a stored state at `target` with a single atomic rename."""
+        write_bytes_atomic(target, self.get(digest))
+
+    def gc(self, save=True):
+        """Evicts least-recently-used objects until the store fits in max_bytes."""
+        objects = self.index["objects"]
+        pinned = set(self.index["refs"].values())
+        total = sum(meta["stored"] for meta in objects.values())
+        evicted = []
+        for digest in sorted(objects, key=lambda d: objects[d].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if digest in pinned:
+                continue
+            try:
+                os.unlink(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            total -= objects.pop(digest)["stored"]
+            evicted.append(digest)
+
+        if evicted:
+            gone = set(evicted)
+            self.index["history"] = [h for h in self.index["history"] if h["hash"] not in gone]
+            logging.debug(f"[DEBUG] 🗑️ Evicted {len(evicted)} snapshot(s)")
+            if save:
+                self._save_index()
+        return evicted
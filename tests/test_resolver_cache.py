@@ -0,0 +1,131 @@
+# tests/test_resolver_cache.py 🧪
+# Probe logic against temp hosts files, a fake resolver and dry-run flushers.
+#
+#   python3 -m pytest tests/
+
+import os
+import sys
+import socket
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resolver_cache import CacheFlusher, sample_blocked_names, probe, post_apply
+from hostlists import render_blacklist
+
+WHITELIST = """\
+# Block everything by default
+0.0.0.0 google.com
+0.0.0.0 facebook.com
+0.0.0.0 youtube.com
+# Add exceptions below
+127.0.0.1 myschool.edu
+127.0.0.1 khanacademy.org
+"""
+
+
+def write(tmp_path, text):
+    path = tmp_path / "hosts"
+    path.write_text(text)
+    return str(path)
+
+
+def fake_resolver(answers):
+    """getaddrinfo stand-in: answers maps a name to the address it resolves to."""
+    def resolve(name, port, family=0, type=0):
+        if name not in answers:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (answers[name], 0))]
+    return resolve
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def fake_flusher(name="fake"):
+    return CacheFlusher(name, [sys.executable, "-c", "pass"], lambda: True, needs_root=False)
+
+
+def test_sample_skips_localhost_and_other_addresses(tmp_path):
+    path = write(tmp_path, "127.0.0.1 localhost\n127.0.1.1 box\n::1 localhost\n"
+                           "127.0.0.1 reddit.com www.reddit.com  # comment\n")
+    assert sample_blocked_names(path) == {"reddit.com": "127.0.0.1", "www.reddit.com": "127.0.0.1"}
+
+
+def test_sample_spreads_over_the_whole_file(tmp_path):
+    domains = [f"site{i}.example.com" for i in range(50)]
+    path = write(tmp_path, render_blacklist(domains))
+    names = sample_blocked_names(path, limit=5)
+    assert len(names) == 5
+    assert "site0.example.com" in names
+    assert any(name.startswith("site4") for name in names)
+
+
+def test_sample_stops_at_whitelist_marker(tmp_path):
+    names = sample_blocked_names(write(tmp_path, WHITELIST), limit=10)
+    assert set(names) == {"google.com", "facebook.com", "youtube.com"}
+
+
+def test_sample_missing_file(tmp_path):
+    assert sample_blocked_names(str(tmp_path / "missing")) == {}
+
+
+def test_probe_returns_once_everything_resolves():
+    clock = FakeClock()
+    pending, waited = probe({"a.com": "127.0.0.1"}, resolver=fake_resolver({"a.com": "127.0.0.1"}),
+                            clock=clock, sleep=clock.sleep)
+    assert pending == [] and waited == 0
+
+
+def test_probe_times_out_on_names_that_still_resolve_elsewhere():
+    clock = FakeClock()
+    resolver = fake_resolver({"a.com": "127.0.0.1", "b.com": "93.184.216.34"})
+    pending, waited = probe({"a.com": "127.0.0.1", "b.com": "127.0.0.1", "c.com": "0.0.0.0"},
+                            resolver=resolver, timeout=2.0, interval=0.5,
+                            clock=clock, sleep=clock.sleep)
+    assert pending == ["b.com", "c.com"]
+    assert waited == 2.0
+
+
+def test_probe_waits_for_caches_to_catch_up():
+    clock = FakeClock()
+    answers = {"a.com": "93.184.216.34"}
+
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if clock.now >= 1.0:
+            answers["a.com"] = "127.0.0.1"
+
+    pending, waited = probe({"a.com": "127.0.0.1"}, resolver=fake_resolver(answers),
+                            timeout=5.0, interval=0.25, clock=clock, sleep=sleep)
+    assert pending == [] and waited == 1.0
+
+
+def test_post_apply_dry_run_only_reports_flushes(tmp_path):
+    calls = []
+    report = post_apply(write(tmp_path, WHITELIST), dry_run=True, resolver=fake_resolver({}),
+                        flushers=[fake_flusher()], runner=lambda *a, **kw: calls.append(a),
+                        record=False)
+    assert calls == []
+    assert [f["name"] for f in report["flushed"]] == ["fake"]
+    assert report["flushed"][0]["dry_run"]
+    assert report["probed"] == ["facebook.com", "google.com", "youtube.com"]
+    assert not report["effective"] and report["time_to_effect"] is None
+
+
+def test_post_apply_effective(tmp_path):
+    calls = []
+    path = write(tmp_path, render_blacklist(["a.com"]))
+    report = post_apply(path, resolver=fake_resolver({"a.com": "127.0.0.1", "www.a.com": "127.0.0.1"}),
+                        flushers=[fake_flusher()], runner=lambda cmd, **kw: calls.append(cmd),
+                        record=False)
+    assert calls == [[sys.executable, "-c", "pass"]]
+    assert report["effective"] and report["pending"] == []
+    assert report["time_to_effect"] is not None
@@ -0,0 +1,294 @@
+# usage_store.py 📊
+# Append-only usage history (SQLite in WAL mode) with precomputed daily rollups
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import sqlite3
+import argparse
+import datetime
+import threading
+
+APP_DIR = "/home/atli/Desktop/Block_python"
+USAGE_DB = os.path.join(APP_DIR, "logs", "usage.db")
+
+# Event kinds written by the tray, the settings GUI and the password check
+EVENT_BLOCK = "block"
+EVENT_UNBLOCK = "unblock"
+EVENT_TOGGLE = "toggle"
+EVENT_UNBLOCK_ATTEMPT = "unblock_attempt"
+EVENT_OVERRIDE = "override"
+EVENT_PASSWORD_OK = "password_ok"
+EVENT_PASSWORD_FAIL = "password_fail"
+EVENT_SCHEDULE_BLOCK = "schedule_block"
+EVENT_SCHEDULE_UNBLOCK = "schedule_unblock"
+EVENT_EFFECT = "effect"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id     INTEGER PRIMARY KEY,
+    ts     REAL NOT NULL,
+    kind   TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events (kind, ts);
+
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day   TEXT NOT NULL,
+    kind  TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, kind)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_blocked (
+    day     TEXT PRIMARY KEY,
+    seconds REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+def _day_of(ts):
+    return datetime.date.fromtimestamp(ts).isoformat()
+
+
+def _split_by_day(start, end):
+    """Yields (day, seconds) chunks of the interval [start, end) in local time."""
+    while start < end:
+        day = datetime.date.fromtimestamp(start)
+        midnight = datetime.datetime.combine(
+            day + datetime.timedelta(days=1), datetime.time.min
+        ).timestamp()
+        chunk_end = min(end, midnight)
+        yield day.isoformat(), chunk_end - start
+        start = chunk_end
+
+
+class UsageStore:
+    """Event log plus daily rollups; every write updates both in one transaction."""
+
+    def __init__(self, path=None):
+        path = path or USAGE_DB
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, kind, detail=None, ts=None):
+        self.record_many([(ts if ts is not None else time.time(), kind, detail)])
+
+    def record_many(self, events):
+        """Appends (ts, kind, detail) tuples and folds them into the rollups."""
+        with self.conn:
+            for ts, kind, detail in events:
+                if detail is not None and not isinstance(detail, str):
+                    detail = json.dumps(detail)
+                self.conn.execute(
+                    "INSERT INTO events (ts, kind, detail) VALUES (?, ?, ?)",
+                    (ts, kind, detail),
+                )
+                self.conn.execute(
+                    "INSERT INTO daily_counts (day, kind, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT (day, kind) DO UPDATE SET count = count + 1",
+                    (_day_of(ts), kind),
+                )
+                if kind == EVENT_BLOCK:
+                    self._open_block(ts)
+                elif kind == EVENT_UNBLOCK:
+                    self._close_block(ts)
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _open_block(self, ts):
+        # Re-applying while already blocked keeps the original start time
+        if self._get_meta("block_started") is None:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('block_started', ?)", (str(ts),)
+            )
+
+    def _close_block(self, ts):
+        started = self._get_meta("block_started")
+        if started is None:
+            return
+        for day, seconds in _split_by_day(float(started), ts):
+            self.conn.execute(
+                "INSERT INTO daily_blocked (day, seconds) VALUES (?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET seconds = seconds + excluded.seconds",
+                (day, seconds),
+            )
+        self.conn.execute("DELETE FROM meta WHERE key = 'block_started'")
+
+    def daily(self, days=7, now=None):
+        """Per-day rollups for the last `days` days (today included), oldest first."""
+        now = now if now is not None else time.time()
+        today = datetime.date.fromtimestamp(now)
+        first = today - datetime.timedelta(days=days - 1)
+        rows = {
+            (first + datetime.timedelta(days=i)).isoformat(): {"blocked_seconds": 0.0, "counts": {}}
+            for i in range(days)
+        }
+
+        for day, seconds in self.conn.execute(
+            "SELECT day, seconds FROM daily_blocked WHERE day BETWEEN ? AND ?",
+            (first.isoformat(), today.isoformat()),
+        ):
+            rows[day]["blocked_seconds"] += seconds
+
+        for day, kind, count in self.conn.execute(
+            "SELECT day, kind, count FROM daily_counts WHERE day BETWEEN ? AND ?",
+            (first.isoformat(), today.isoformat()),
+        ):
+            rows[day]["counts"][kind] = count
+
+        # Still blocked: count the open interval up to now
+        started = self._get_meta("block_started")
+        if started is not None:
+            for day, seconds in _split_by_day(float(started), now):
+                if day in rows:
+                    rows[day]["blocked_seconds"] += seconds
+
+        return [dict(day=day, **values) for day, values in rows.items()]
+
+    def summary(self, days=7, now=None):
+        per_day = self.daily(days, now)
+        counts = {}
+        for row in per_day:
+            for kind, count in row["counts"].items():
+                counts[kind] = counts.get(kind, 0) + count
+        blocked = sum(row["blocked_seconds"] for row in per_day)
+        return {
+            "from": per_day[0]["day"],
+            "to": per_day[-1]["day"],
+            "blocked_hours": round(blocked / 3600, 2),
+            "unblock_attempts": counts.get(EVENT_UNBLOCK_ATTEMPT, 0),
+            "overrides": counts.get(EVENT_OVERRIDE, 0),
+            "counts": counts,
+        }
+
+    def recent_events(self, kind=None, since=None, limit=50):
+        query = "SELECT ts, kind, detail FROM events WHERE ts >= ?"
+        params = [since if since is not None else 0]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+        return [
+            {"ts": ts, "kind": k, "detail": detail}
+            for ts, k, detail in self.conn.execute(query, params)
+        ]
+
+
+# 🧵 Background writer so callers on the UI thread never wait on disk
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def record_event(kind, detail=None):
+    """Queues a usage event; the actual write happens on the writer thread."""
+    global _writer
+    _queue.put((time.time(), kind, detail))
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="usage-writer", daemon=True)
+            _writer.start()
+            atexit.register(_shutdown)
+
+
+def _writer_loop():
+    try:
+        store = UsageStore()
+    except Exception as e:
+        logging.error(f"[ERROR] Usage store unavailable: {e}")
+        store = None
+
+    running = True
+    while running:
+        batch = [_queue.get()]
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in batch:
+            running = False
+            batch = [item for item in batch if item is not None]
+        if store and batch:
+            try:
+                store.record_many(batch)
+            except Exception as e:
+                logging.error(f"[ERROR] Failed to record usage events: {e}")
+
+    if store:
+        store.close()
+
+
+def _shutdown(timeout=2.0):
+    _queue.put(None)
+    if _writer is not None:
+        _writer.join(timeout)
+
+
+def format_report(summary, per_day):
+    lines = [
+        f"Usage {summary['from']} → {summary['to']}",
+        f"  Blocked:          {summary['blocked_hours']:.2f} h",
+        f"  Unblock attempts: {summary['unblock_attempts']}",
+        f"  Overrides:        {summary['overrides']}",
+        "",
+    ]
+    for row in per_day:
+        toggles = row["counts"].get(EVENT_TOGGLE, 0)
+        lines.append(f"  {row['day']}  {row['blocked_seconds'] / 3600:5.2f} h  {toggles} toggles")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Focus Blocker usage report")
+    parser.add_argument("--days", type=int, default=7, help="number of days to report (default: 7)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--events", type=int, metavar="N", help="also list the N most recent events")
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+
+    store = UsageStore(args.db)
+    try:
+        summary = store.summary(args.days)
+        per_day = store.daily(args.days)
+        events = store.recent_events(limit=args.events) if args.events else []
+    finally:
+        store.close()
+
+    if args.json:
+        json.dump({"summary": summary, "daily": per_day, "events": events}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_report(summary, per_day))
+        for event in events:
+            stamp = datetime.datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"  {stamp}  {event['kind']}" + (f"  {event['detail']}" if event["detail"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())